@@ -2,6 +2,140 @@ from json import load
 from os.path import dirname, join
 import re
 
+import numpy as np
+
+FAIR_MATURITY_MODEL = {
+    'FDMFE1[SQ001]': 'RDA-F1-01M',
+    'FDMFE1[SQ002]': 'RDA-F1-01D',
+    'FDMFE1[SQ003]': 'RDA-F1-02M',
+    'FDMFE1[SQ004]': 'RDA-F1-02D',
+    'FDMFE1[SQ005]': 'RDA-F2-01M',
+    'FDMFE1[SQ006]': 'RDA-F3-01M',
+    'FDMFE1[SQ007]': 'RDA-F4-01M',
+    'FDMAE1[SQ001]': 'RDA-A1-02M',
+    'FDMAE1[SQ002]': 'RDA-A1-02D',
+    'FDMAE1[SQ003]': 'RDA-A1-03M',
+    'FDMAE1[SQ004]': 'RDA-A1-03D',
+    'FDMAE1[SQ005]': 'RDA-A1-04M',
+    'FDMAE1[SQ006]': 'RDA-A1-04D',
+    'FDMAE1[SQ007]': 'RDA-A1.1-01M',
+    'FDMAE1[SQ008]': 'RDA-A2-01M',
+    'FDMAI1[SQ001]': 'RDA-A1-01M',
+    'FDMAI1[SQ002]': 'RDA-A1.1-01D',
+    'FDMAI1[SQ003]': 'RDA-A1-05D',
+    'FDMAU1[SQ001]': 'RDA-A1.2-01D',
+    'FDMRE1[SQ001]': 'RDA-R1-01M',
+    'FDMRE1[SQ002]': 'RDA-R1.1-01M',
+    'FDMRE1[SQ003]': 'RDA-R1.3-01M',
+    'FDMRE1[SQ004]': 'RDA-R1.3-01D',
+    'FDMRE1[SQ005]': 'RDA-R1.3-02M',
+    'FDMRI1[SQ001]': 'RDA-R1.1-02M',
+    'FDMRI1[SQ002]': 'RDA-R1.1-03M',
+    'FDMRI1[SQ003]': 'RDA-R1.2-01M',
+    'FDMRI1[SQ004]': 'RDA-R1.3-02D',
+    'FDMRU1[SQ001]': 'RDA-R1.2-02M',
+    'FDMII1[SQ001]': 'RDA-I1-01M',
+    'FDMII1[SQ002]': 'RDA-I1-01D',
+    'FDMII1[SQ003]': 'RDA-I1-02M',
+    'FDMII1[SQ004]': 'RDA-I1-02D',
+    'FDMII1[SQ005]': 'RDA-I2-01M',
+    'FDMII1[SQ006]': 'RDA-I3-01M',
+    'FDMII1[SQ007]': 'RDA-I3-03M',
+    'FDMIU1[SQ001]': 'RDA-I2-01D',
+    'FDMIU1[SQ002]': 'RDA-I3-01D',
+    'FDMIU1[SQ003]': 'RDA-I3-02M',
+    'FDMIU1[SQ004]': 'RDA-I3-02D',
+    'FDMIU1[SQ005]': 'RDA-I3-04M'
+}
+
+FMM_CLASSIFICATION = {
+    'Essential': [
+        'RDA-F1-01M', 'RDA-F1-01D', 'RDA-F1-02M', 'RDA-F1-02D', 'RDA-F2-01M', 'RDA-F3-01M', 'RDA-F4-01M',
+        'RDA-A1-02M', 'RDA-A1-02D', 'RDA-A1-03M', 'RDA-A1-03D', 'RDA-A1-04M', 'RDA-A1-04D', 'RDA-A1.1-01M',
+        'RDA-A2-01M', 'RDA-R1-01M', 'RDA-R1.1-01M', 'RDA-R1.3-01M', 'RDA-R1.3-01D', 'RDA-R1.3-02M'
+    ],
+    'Important': [
+        'RDA-A1-01M', 'RDA-A1-05D', 'RDA-A1.1-01D', 'RDA-I1-01M', 'RDA-I1-01D', 'RDA-I1-02M', 'RDA-I1-02D',
+        'RDA-I2-01M', 'RDA-I3-01M', 'RDA-I3-03M', 'RDA-R1.1-02M', 'RDA-R1.1-03M', 'RDA-R1.2-01M',
+        'RDA-R1.3-02D'
+    ],
+    'Useful': [
+        'RDA-A1.2-01D', 'RDA-I2-01D', 'RDA-I3-01D', 'RDA-I3-02M', 'RDA-I3-02D', 'RDA-I3-04M', 'RDA-R1.2-02M'
+    ]
+}
+
+
+FAIR_PRINCIPLES = {
+    'F': 'Findable',
+    'A': 'Accessible',
+    'I': 'Interoperable',
+    'R': 'Reusable'
+}
+
+THRESHOLD = {
+    'Essential': 1.0,
+    'Important': 2.0,
+    'Useful': 2.0
+}
+
+MIN_MATURITY = 1
+MAX_MATURITY = 5
+
+
+def indicator_positions() -> tuple:
+    """
+    Get the priority and the FAIR principle of each indicator of the FAIR maturity model
+    :return: two arrays with the index in FMM_CLASSIFICATION and in FAIR_PRINCIPLES of each indicator,
+             following the order of FAIR_MATURITY_MODEL
+    """
+    categories = list(FMM_CLASSIFICATION.keys())
+    principles = list(FAIR_PRINCIPLES.keys())
+    category = {x: categories.index(c) for c in categories for x in FMM_CLASSIFICATION[c]}
+
+    indicators = list(FAIR_MATURITY_MODEL.values())
+    category_index = np.array([category[x] for x in indicators])
+    principle_index = np.array([principles.index(re.match(r"RDA-([FAIR])", x).group(1)) for x in indicators])
+
+    return category_index, principle_index
+
+
+def classification_sum(maturity: np.ndarray) -> tuple:
+    """
+    Sum the maturity values of several responses per FAIR principle and priority
+    :param maturity: array (responses, indicators) with the values in the order of FAIR_MATURITY_MODEL
+    :return: array (responses, principles, priorities) with the sums and array (principles, priorities)
+             with the number of indicators of each group
+    """
+    category_index, principle_index = indicator_positions()
+
+    membership = np.zeros((len(category_index), len(FAIR_PRINCIPLES), len(FMM_CLASSIFICATION)), dtype=int)
+    membership[np.arange(len(category_index)), principle_index, category_index] = 1
+
+    sums = np.tensordot(maturity, membership, axes=(-1, 0))
+
+    return sums, membership.sum(axis=0)
+
+
+def compliance_level(sums: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Vectorized equivalent of Data.classification_data_compliance_level
+    :param sums: array (..., priorities) with the sum of the maturity values of a FAIR principle per priority
+    :param counts: number of indicators of the FAIR principle per priority, broadcastable to sums
+    :return: array (...) with the compliance level
+    """
+    b = np.array(list(THRESHOLD.values()))
+    n = np.maximum(counts, 1)
+
+    # A priority without indicators takes the maximum normalized value but never reaches the threshold,
+    # as in Data.classification_data_threshold
+    normalized = (sums - n * MIN_MATURITY) / (n * (MAX_MATURITY - MIN_MATURITY)) * b
+    normalized = np.where(counts > 0, normalized, b)
+    h = (counts > 0) & (sums == counts * MAX_MATURITY)
+
+    return (normalized[..., 0] +
+            h[..., 0] * normalized[..., 1] +
+            h[..., 0] * h[..., 1] * normalized[..., 2])
+
 
 class Data(object):
     def __init__(self, json_file='example.json'):
@@ -11,8 +145,8 @@ class Data(object):
         with open(file=filename, mode='r') as f:
             self.raw_data = load(f)
             
-        # used as default data_name when drawing graphs
-        self.response_id = self.raw_data['responses'][0]["id"]
+        # used as default data_name when drawing graphs, the first response with every indicator answered
+        self.response_id = self.__answered_responses__()[0]["id"]
         
         self.__pattern__ = re.compile(pattern=r"RDA-([FAIR]).+-.*", flags=0)
 
@@ -37,74 +171,75 @@ class Data(object):
         self.classification_data_compliance_level()
 
     def get_fair_maturity_model(self) -> None:
-        fair_maturity_model = {
-            'FDMFE1[SQ001]': 'RDA-F1-01M',
-            'FDMFE1[SQ002]': 'RDA-F1-01D',
-            'FDMFE1[SQ003]': 'RDA-F1-02M',
-            'FDMFE1[SQ004]': 'RDA-F1-02D',
-            'FDMFE1[SQ005]': 'RDA-F2-01M',
-            'FDMFE1[SQ006]': 'RDA-F3-01M',
-            'FDMFE1[SQ007]': 'RDA-F4-01M',
-            'FDMAE1[SQ001]': 'RDA-A1-02M',
-            'FDMAE1[SQ002]': 'RDA-A1-02D',
-            'FDMAE1[SQ003]': 'RDA-A1-03M',
-            'FDMAE1[SQ004]': 'RDA-A1-03D',
-            'FDMAE1[SQ005]': 'RDA-A1-04M',
-            'FDMAE1[SQ006]': 'RDA-A1-04D',
-            'FDMAE1[SQ007]': 'RDA-A1.1-01M',
-            'FDMAE1[SQ008]': 'RDA-A2-01M',
-            'FDMAI1[SQ001]': 'RDA-A1-01M',
-            'FDMAI1[SQ002]': 'RDA-A1.1-01D',
-            'FDMAI1[SQ003]': 'RDA-A1-05D',
-            'FDMAU1[SQ001]': 'RDA-A1.2-01D',
-            'FDMRE1[SQ001]': 'RDA-R1-01M',
-            'FDMRE1[SQ002]': 'RDA-R1.1-01M',
-            'FDMRE1[SQ003]': 'RDA-R1.3-01M',
-            'FDMRE1[SQ004]': 'RDA-R1.3-01D',
-            'FDMRE1[SQ005]': 'RDA-R1.3-02M',
-            'FDMRI1[SQ001]': 'RDA-R1.1-02M',
-            'FDMRI1[SQ002]': 'RDA-R1.1-03M',
-            'FDMRI1[SQ003]': 'RDA-R1.2-01M',
-            'FDMRI1[SQ004]': 'RDA-R1.3-02D',
-            'FDMRU1[SQ001]': 'RDA-R1.2-02M',
-            'FDMII1[SQ001]': 'RDA-I1-01M',
-            'FDMII1[SQ002]': 'RDA-I1-01D',
-            'FDMII1[SQ003]': 'RDA-I1-02M',
-            'FDMII1[SQ004]': 'RDA-I1-02D',
-            'FDMII1[SQ005]': 'RDA-I2-01M',
-            'FDMII1[SQ006]': 'RDA-I3-01M',
-            'FDMII1[SQ007]': 'RDA-I3-03M',
-            'FDMIU1[SQ001]': 'RDA-I2-01D',
-            'FDMIU1[SQ002]': 'RDA-I3-01D',
-            'FDMIU1[SQ003]': 'RDA-I3-02M',
-            'FDMIU1[SQ004]': 'RDA-I3-02D',
-            'FDMIU1[SQ005]': 'RDA-I3-04M'
-        }
+        response = self.__answered_responses__()[0]
 
-        self.fair_maturity_model_data = {fair_maturity_model[key]: int(self.raw_data['responses'][0][key])
-                                         for key in fair_maturity_model.keys()}
+        self.fair_maturity_model_data = {FAIR_MATURITY_MODEL[key]: int(response[key])
+                                         for key in FAIR_MATURITY_MODEL.keys()}
 
-    def get_fdm_classification(self) -> None:
-        fmm_classification = {
-            'Essential': [
-                'RDA-F1-01M', 'RDA-F1-01D', 'RDA-F1-02M', 'RDA-F1-02D', 'RDA-F2-01M', 'RDA-F3-01M', 'RDA-F4-01M',
-                'RDA-A1-02M', 'RDA-A1-02D', 'RDA-A1-03M', 'RDA-A1-03D', 'RDA-A1-04M', 'RDA-A1-04D', 'RDA-A1.1-01M',
-                'RDA-A2-01M', 'RDA-R1-01M', 'RDA-R1.1-01M', 'RDA-R1.3-01M', 'RDA-R1.3-01D', 'RDA-R1.3-02M'
-            ],
-            'Important': [
-                'RDA-A1-01M', 'RDA-A1-05D', 'RDA-A1.1-01D', 'RDA-I1-01M', 'RDA-I1-01D', 'RDA-I1-02M', 'RDA-I1-02D',
-                'RDA-I2-01M', 'RDA-I3-01M', 'RDA-I3-03M', 'RDA-R1.1-02M', 'RDA-R1.1-03M', 'RDA-R1.2-01M',
-                'RDA-R1.3-02D'
-            ],
-            'Useful': [
-                'RDA-A1.2-01D', 'RDA-I2-01D', 'RDA-I3-01D', 'RDA-I3-02M', 'RDA-I3-02D', 'RDA-I3-04M', 'RDA-R1.2-02M'
-            ]
-        }
+    def get_maturity_matrix(self) -> tuple:
+        """
+        Get the FAIR maturity model values of all the answered responses, not only the first one
+        :return: list with the id of each response and array (responses, indicators) with the values in the
+                 order of FAIR_MATURITY_MODEL
+        """
+        responses = self.__answered_responses__()
+
+        response_ids = [x["id"] for x in responses]
+        maturity = np.array([[int(x[key]) for key in FAIR_MATURITY_MODEL.keys()] for x in responses], dtype=int)
+
+        return response_ids, maturity
+
+    def get_response_dates(self) -> np.ndarray:
+        """
+        Get the date of all the answered responses, the submit date or the last datestamp if it was not submitted
+        :return: array (responses,) of datetime64, in the same order as get_maturity_matrix
+        """
+        dates = list()
+
+        for x in self.__answered_responses__():
+            date = x.get("submitdate") or x.get("datestamp")
+
+            if not date:
+                raise ValueError(f"Sorry, response has no submitdate or datestamp: {x['id']}")
+
+            dates.append(date)
+
+        return np.array(dates, dtype='datetime64[s]')
+
+    def __answered_responses__(self) -> list:
+        """
+        Get the responses with a value for every indicator. Responses that were not completed store the
+        unanswered indicators as null or "" and are skipped.
+        :return: list with the answered responses
+        """
+        result = list()
 
+        for x in self.raw_data['responses']:
+            values = [x.get(key) for key in FAIR_MATURITY_MODEL.keys()]
+
+            if any(value is None or value == "" for value in values):
+                continue
+
+            try:
+                values = [int(value) for value in values]
+            except (TypeError, ValueError):
+                raise ValueError(f"Sorry, response has a maturity value that is not an integer: {x['id']}")
+
+            if any(value < MIN_MATURITY or value > MAX_MATURITY for value in values):
+                raise ValueError(f"Sorry, response has a maturity value out of range: {x['id']}")
+
+            result.append(x)
+
+        if len(result) == 0:
+            raise ValueError("Sorry, no response has a value for every indicator")
+
+        return result
+
+    def get_fdm_classification(self) -> None:
         self.FMMClassification_data = {
-            'Essential': self.__classification_per_category__(classes=fmm_classification, category='Essential'),
-            'Important': self.__classification_per_category__(classes=fmm_classification, category='Important'),
-            'Useful': self.__classification_per_category__(classes=fmm_classification, category='Useful')
+            'Essential': self.__classification_per_category__(classes=FMM_CLASSIFICATION, category='Essential'),
+            'Important': self.__classification_per_category__(classes=FMM_CLASSIFICATION, category='Important'),
+            'Useful': self.__classification_per_category__(classes=FMM_CLASSIFICATION, category='Useful')
         }
 
         self.FMMClassification_data_length = {
@@ -117,15 +252,8 @@ class Data(object):
         self.fairness_classification_per_indicator = self.__classification_per_indicator__()
 
     def __classification_per_category__(self, classes: dict, category: str) -> dict:
-        result = {
-            'F': 'Findable',
-            'A': 'Accessible',
-            'I': 'Interoperable',
-            'R': 'Reusable'
-        }
-
         # Create the structure
-        aux1 = {x: dict() for x in [result[x] for x in result]}
+        aux1 = {x: dict() for x in [FAIR_PRINCIPLES[x] for x in FAIR_PRINCIPLES]}
         aux2 = {key: self.fair_maturity_model_data[key] for key in classes[category]}
 
         for key, value in aux2.items():
@@ -134,7 +262,7 @@ class Data(object):
             if category is None:
                 raise Exception(f"Sorry, key is not expected: {key}")
 
-            aux1[result[category[0]]][key] = value
+            aux1[FAIR_PRINCIPLES[category[0]]][key] = value
 
         return aux1
 
@@ -143,13 +271,6 @@ class Data(object):
         return value
 
     def __classification_per_indicator__(self) -> dict:
-        result = {
-            'F': 'Findable',
-            'A': 'Accessible',
-            'I': 'Interoperable',
-            'R': 'Reusable'
-        }
-
         final_data = {
             'Findable': dict(),
             'Accessible': dict(),
@@ -158,7 +279,7 @@ class Data(object):
         }
 
         for key, value in self.fair_maturity_model_data.items():
-            aux = result[self.__pattern__.findall(key)[0]]
+            aux = FAIR_PRINCIPLES[self.__pattern__.findall(key)[0]]
 
             if aux is None:
                 raise Exception(f"Sorry, key is not expected: {key}")
@@ -194,18 +315,13 @@ class Data(object):
         :return:
         """
         a = 0.0
-        b_values = {
-            'Essential': 1.0,
-            'Important': 2.0,
-            'Useful': 2.0
-        }
-        min_ajk = 1.0
-        max_ajk = 5.0
+        min_ajk = float(MIN_MATURITY)
+        max_ajk = float(MAX_MATURITY)
 
         for i in list(self.FMMClassification_data.keys()):
             self.FMMClassification_data_normalized[i] = dict()
 
-            b = b_values[i]
+            b = THRESHOLD[i]
             n = self.FMMClassification_data_len[i]
             ajk = self.FMMClassification_data_sum[i]
 
@@ -219,26 +335,14 @@ class Data(object):
                     self.FMMClassification_data_normalized[i][j] = None
 
     def classification_data_threshold(self):
-        threshold = {
-            'Essential': 1.0,
-            'Important': 2.0,
-            'Useful': 2.0
-        }
-
         for i in list(self.FMMClassification_data_normalized.keys()):
             self.FMMClassification_data_threshold[i] = dict()
 
             for j in list(self.FMMClassification_data_normalized[i].keys()):
                 self.FMMClassification_data_threshold[i][j] = (
-                    1 if self.FMMClassification_data_normalized[i][j] == threshold[i] else 0)
+                    1 if self.FMMClassification_data_normalized[i][j] == THRESHOLD[i] else 0)
 
     def classification_data_compliance_level(self):
-        threshold = {
-            'Essential': 1.0,
-            'Important': 2.0,
-            'Useful': 2.0
-        }
-
         keys = list(list(self.fairness_classification_per_indicator.keys()))
 
         n = self.FMMClassification_data_normalized
@@ -250,17 +354,17 @@ class Data(object):
             # In case that the FAIR principle has no indicators we fix the value of the normalized to the
             # maximum value --> ['Essential': 1, 'Important': 2, 'Useful': 2]
             if n['Important'][i] is None:
-                n_value_important = threshold['Important']
+                n_value_important = THRESHOLD['Important']
             else:
                 n_value_important = n['Important'][i]
 
             if n['Useful'][i] is None:
-                n_value_useful = threshold['Useful']
+                n_value_useful = THRESHOLD['Useful']
             else:
                 n_value_useful = n['Useful'][i]
 
             if aux[i] is None:
-                n_value_essential = threshold['Essential']
+                n_value_essential = THRESHOLD['Essential']
             else:
                 n_value_essential = aux[i]
 
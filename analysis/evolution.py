@@ -0,0 +1,218 @@
+import matplotlib.pyplot as plt
+from matplotlib.animation import FuncAnimation, PillowWriter
+from analysis.radar import radar_factory
+import numpy as np
+from .data import (Data, FAIR_MATURITY_MODEL, FAIR_PRINCIPLES, MIN_MATURITY, MAX_MATURITY,
+                   classification_sum, compliance_level, indicator_positions)
+
+# Number of months of each period
+PERIODS = {
+    'month': 1,
+    'quarter': 3,
+    'year': 12
+}
+
+
+class Evolution:
+    def __init__(self, data: Data, period: str = 'quarter'):
+        """
+        Evolution of the compliance of all the responses of a dataset across survey rounds. The responses are
+        bucketed by the period of their submit date and aggregated per period. The responses carry no dataset
+        identifier, so the trajectories are cohort aggregates (mean, minimum and maximum of every response of
+        the period), not the trajectory of each assessed dataset. Responses with unanswered indicators are
+        skipped, see Data.get_maturity_matrix.
+
+        Parameters:
+        - data (Data): The dataset whose responses are analysed.
+        - period (str): Length of the buckets, one of 'month', 'quarter' or 'year'.
+
+        Attributes:
+        - self.periods: Array (periods,) of datetime64 with the start of each period that has responses.
+        - self.period_labels: Label of each period, e.g. '2024-Q1'.
+        - self.count: Array (periods,) with the number of responses of each period.
+        - self.compliance_level: Array (periods, principles) with the mean compliance level.
+        - self.compliance_level_minimum: Array (periods, principles) with the minimum compliance level.
+        - self.compliance_level_maximum: Array (periods, principles) with the maximum compliance level.
+        - self.maturity: Array (periods, indicators) with the mean maturity value of each indicator.
+        - self.cmap: A colormap from white to blue (Blues) for visual consistency in plots.
+        """
+        if period not in PERIODS:
+            raise ValueError(f"Unknown value for 'period': {period}")
+
+        self.data = data
+        self.period = period
+
+        self.indicators = list(FAIR_MATURITY_MODEL.values())
+        self.principles = list(FAIR_PRINCIPLES.values())
+        self.principle_index = indicator_positions()[1]
+
+        self.periods = np.empty(0, dtype='datetime64[M]')
+        self.period_labels = list()
+        self.count = np.empty(0, dtype=int)
+        self.compliance_level = np.empty((0, len(self.principles)))
+        self.compliance_level_minimum = np.empty((0, len(self.principles)))
+        self.compliance_level_maximum = np.empty((0, len(self.principles)))
+        self.maturity = np.empty((0, len(self.indicators)))
+
+        self.cmap = plt.cm.get_cmap('Blues')
+
+        self.get_trajectories()
+
+    def get_trajectories(self) -> None:
+        _, maturity = self.data.get_maturity_matrix()
+        dates = self.data.get_response_dates()
+
+        sums, counts = classification_sum(maturity)
+        level = compliance_level(sums, counts)
+
+        # Index of the period of each response, counted in periods since 1970
+        bucket = dates.astype('datetime64[M]').astype(int) // PERIODS[self.period]
+
+        # Sort the responses by period so that every period is a contiguous slice
+        order = np.argsort(bucket, kind='stable')
+        bucket = bucket[order]
+        periods, start, self.count = np.unique(bucket, return_index=True, return_counts=True)
+
+        self.compliance_level = np.add.reduceat(level[order], start, axis=0) / self.count[:, np.newaxis]
+        self.compliance_level_minimum = np.minimum.reduceat(level[order], start, axis=0)
+        self.compliance_level_maximum = np.maximum.reduceat(level[order], start, axis=0)
+        self.maturity = np.add.reduceat(maturity[order], start, axis=0) / self.count[:, np.newaxis]
+
+        months = periods * PERIODS[self.period]
+        self.periods = months.astype('datetime64[M]')
+        self.period_labels = [self.__period_label__(x) for x in months]
+
+    def __period_label__(self, months: int) -> str:
+        year, month = 1970 + months // 12, months % 12 + 1
+
+        if self.period == 'year':
+            return f"{year}"
+        elif self.period == 'quarter':
+            return f"{year}-Q{(month - 1) // 3 + 1}"
+        else:
+            return f"{year}-{month:02d}"
+
+    def create_trajectory_figure(self, band: bool = True):
+        """
+        Line chart with the mean compliance level of each FAIR principle per period.
+        :param band: Shade the range between the minimum and maximum compliance level of each period.
+        """
+        fig, ax = plt.subplots(figsize=(13, 8))
+
+        for i, principle in enumerate(self.principles):
+            color = self.cmap(0.4 + 0.6 * i / (len(self.principles) - 1))
+
+            ax.plot(self.periods, self.compliance_level[:, i], color=color, marker='o', linewidth=3,
+                    label=principle)
+
+            if band:
+                ax.fill_between(self.periods,
+                                self.compliance_level_minimum[:, i],
+                                self.compliance_level_maximum[:, i],
+                                color=color, alpha=0.15, label='_nolegend_')
+
+        ax.set_ylim([0, 5.5])
+        ax.set_ylabel('FAIRness Level score', fontsize=16)
+        ax.grid(axis='y', color='grey', lw=1, alpha=0.3)
+
+        ax.set_title(label=f'FDM FAIRness Level score per {self.period}',
+                     fontsize=24, color=self.cmap(1.0), weight='semibold')
+
+        ax.legend(loc="center left",
+                  bbox_to_anchor=(1, 0, 0.5, 1),
+                  fontsize=16)
+
+        fig.autofmt_xdate()
+        fig.subplots_adjust(right=0.8)
+
+        return fig
+
+    def save_radar_animation(self, category: str, filename: str, fps: int = 2):
+        """
+        Animated radar chart of the mean maturity value of the indicators of a FAIR principle, one frame per
+        period. The artists are created once and updated in place in each frame.
+        :param category: FAIR principle, e.g. 'Findable'.
+        :param filename: Path of the GIF file to write.
+        :param fps: Frames per second.
+        """
+        columns = np.flatnonzero(self.principle_index == self.principles.index(category))
+        labels = [self.indicators[x] for x in columns]
+
+        theta = radar_factory(num_vars=len(columns), frame='polygon')
+
+        fig, ax = plt.subplots(figsize=(10, 10), subplot_kw=dict(projection='radar'))
+
+        title = ax.set_title(label='',
+                             size='large',
+                             position=(0.5, 0.9),
+                             horizontalalignment='center',
+                             verticalalignment='top',
+                             pad=20,
+                             fontsize=16,
+                             color=self.cmap(1.0),
+                             weight='semibold')
+
+        line, = ax.plot(theta, self.maturity[0, columns], color='#48BADD')
+        polygon, = ax.fill(theta, self.maturity[0, columns], alpha=0.25, label='_nolegend_')
+
+        ax.set_ylim([0, MAX_MATURITY])
+        ax.set_rgrids(list(range(MIN_MATURITY, MAX_MATURITY + 1)))
+        ax.xaxis.set_tick_params(pad=25, rotation=10)
+        ax.set_varlabels(labels)
+
+        def update(frame):
+            values = self.maturity[frame, columns]
+
+            # RadarAxes closes the line by repeating the first point
+            line.set_data(np.append(theta, theta[0]), np.append(values, values[0]))
+            polygon.set_xy(np.column_stack((theta, values)))
+            title.set_text(f"{category} {self.period_labels[frame]} ({self.count[frame]} responses)")
+
+            return line, polygon, title
+
+        self.__save_animation__(fig=fig, update=update, filename=filename, fps=fps)
+
+    def save_level_score_animation(self, filename: str, fps: int = 2):
+        """
+        Animated bar chart of the mean compliance level of each FAIR principle, one frame per period.
+        The artists are created once and updated in place in each frame.
+        :param filename: Path of the GIF file to write.
+        :param fps: Frames per second.
+        """
+        fig, ax = plt.subplots(figsize=(13, 8))
+
+        position = np.arange(len(self.principles))
+
+        bars = ax.bar(position, self.compliance_level[0], alpha=0.6, color="green", edgecolor='none', width=0.5)
+        values = [ax.text(x=x, y=0, s='', horizontalalignment='center', verticalalignment='bottom', fontsize=16)
+                  for x in position]
+
+        ax.set_xticks(position, self.principles, fontsize=18, color=self.cmap(1.0), weight='semibold')
+        ax.set_ylim([0, 5.5])
+        ax.grid(axis='y', color='grey', lw=1, alpha=0.3)
+
+        title = ax.set_title(label='', fontsize=24, color=self.cmap(1.0), weight='semibold')
+
+        def update(frame):
+            for bar, text, y in zip(bars, values, self.compliance_level[frame]):
+                bar.set_height(y)
+                text.set_position((bar.get_x() + bar.get_width() / 2, y))
+                text.set_text(f"{y:.2f}")
+
+            title.set_text(f"FDM FAIRness Level score\n{self.period_labels[frame]} "
+                           f"({self.count[frame]} responses)")
+
+            return *bars, *values, title
+
+        self.__save_animation__(fig=fig, update=update, filename=filename, fps=fps)
+
+    def __save_animation__(self, fig, update, filename: str, fps: int) -> None:
+        animation = FuncAnimation(fig=fig, func=update, frames=len(self.periods), blit=False)
+        animation.save(filename, writer=PillowWriter(fps=fps))
+        plt.close(fig)
+
+
+if __name__ == '__main__':
+    e = Evolution(Data(), period='quarter')
+    e.create_trajectory_figure()
+    plt.show()
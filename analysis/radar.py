@@ -51,6 +51,7 @@ def radar_factory(num_vars, frame='circle'):
             lines = super().plot(*args, **kwargs)
             for line in lines:
                 self._close_line(line)
+            return lines
 
         def _close_line(self, line):
             x, y = line.get_data()
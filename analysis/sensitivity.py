@@ -0,0 +1,116 @@
+import numpy as np
+from typing import Optional
+from .data import (Data, FAIR_MATURITY_MODEL, FAIR_PRINCIPLES, MIN_MATURITY, MAX_MATURITY,
+                   classification_sum, compliance_level, indicator_positions)
+
+
+class Sensitivity:
+    def __init__(self, data: Data):
+        """
+        What-if analysis of the compliance level of every response of a dataset. For each response it evaluates
+        all the single-indicator improvements (each indicator raised to each higher maturity value) at once.
+        Responses with unanswered indicators are skipped, see Data.get_maturity_matrix.
+
+        Parameters:
+        - data (Data): The dataset whose responses are analysed.
+
+        Attributes:
+        - self.response_ids: The id of each response.
+        - self.indicators: The indicators of the FAIR maturity model, in the order of the arrays.
+        - self.values: The maturity values an indicator can be raised to.
+        - self.maturity: Array (responses, indicators) with the current maturity values.
+        - self.compliance_level: Array (responses, principles) with the current compliance levels.
+        - self.gain: Array (responses, indicators, values) with the compliance-level gain of the FAIR principle
+                     of the indicator when raising it to the value, NaN if the value is not an improvement.
+        """
+        self.response_ids, self.maturity = data.get_maturity_matrix()
+        self.indicators = list(FAIR_MATURITY_MODEL.values())
+        self.principles = list(FAIR_PRINCIPLES.values())
+        self.values = np.arange(MIN_MATURITY, MAX_MATURITY + 1)
+
+        self.category_index, self.principle_index = indicator_positions()
+
+        self.compliance_level = np.empty((0, len(self.principles)))
+        self.gain = np.empty((0, len(self.indicators), len(self.values)))
+
+        self.get_gain()
+
+    def get_gain(self) -> None:
+        sums, counts = classification_sum(self.maturity)
+        self.compliance_level = compliance_level(sums, counts)
+
+        # Sums per priority of the FAIR principle of each indicator: (responses, indicators, priorities)
+        principle_sums = sums[:, self.principle_index, :]
+        principle_counts = counts[self.principle_index, :]
+
+        # Increment of the sum of the priority of each indicator when raising it to each value:
+        # (responses, indicators, values)
+        delta = self.values[np.newaxis, np.newaxis, :] - self.maturity[:, :, np.newaxis]
+
+        # Only the priority of the indicator changes: (responses, indicators, values, priorities)
+        one_hot = np.eye(len(counts[0]), dtype=int)[self.category_index]
+        new_sums = principle_sums[:, :, np.newaxis, :] + delta[..., np.newaxis] * one_hot[np.newaxis, :, np.newaxis, :]
+
+        new_level = compliance_level(new_sums, principle_counts[:, np.newaxis, :])
+        current_level = self.compliance_level[:, self.principle_index]
+
+        self.gain = np.where(delta > 0, new_level - current_level[:, :, np.newaxis], np.nan)
+
+    def ranking(self, response_id: Optional[str] = None, top: Optional[int] = None,
+                min_gain: float = 0.0) -> dict:
+        """
+        Rank the single-indicator improvements of a response by compliance-level gain per FAIR principle.
+        Ties are broken by the smallest increment of maturity value and then by the order of the indicators.
+
+        :param response_id: The response to rank. Defaults to the first answered response, as in Data.
+        :param top: Maximum number of improvements per FAIR principle, all of them if None.
+        :param min_gain: Only the improvements with a gain strictly greater than this value are kept.
+        :return: Dictionary with a list of improvements per FAIR principle, each of them a dictionary with the
+                 indicator, its current value, the new value, the new compliance level and the gain.
+        """
+        if response_id is None:
+            row = 0
+        elif response_id in self.response_ids:
+            row = self.response_ids.index(response_id)
+        else:
+            raise ValueError(f"Sorry, response not found or not fully answered: {response_id}")
+
+        return self.__ranking_per_response__(row=row, top=top, min_gain=min_gain)
+
+    def cohort_ranking(self, top: Optional[int] = None, min_gain: float = 0.0) -> dict:
+        """
+        Rank the single-indicator improvements of every response, see ranking.
+        :return: Dictionary with the ranking of each response id.
+        """
+        return {x: self.__ranking_per_response__(row=i, top=top, min_gain=min_gain)
+                for i, x in enumerate(self.response_ids)}
+
+    def __ranking_per_response__(self, row: int, top: Optional[int], min_gain: float) -> dict:
+        gain = self.gain[row].ravel()
+        indicator = np.repeat(np.arange(len(self.indicators)), len(self.values))
+        value = np.tile(self.values, len(self.indicators))
+        step = value - self.maturity[row, indicator]
+
+        # lexsort uses the last key as the primary one
+        order = np.lexsort((indicator, step, -np.nan_to_num(gain, nan=-np.inf)))
+        order = order[gain[order] > min_gain]
+
+        result = dict()
+
+        for p, principle in enumerate(self.principles):
+            selected = order[self.principle_index[indicator[order]] == p][:top]
+
+            result[principle] = [{
+                'indicator': self.indicators[indicator[k]],
+                'current': int(self.maturity[row, indicator[k]]),
+                'value': int(value[k]),
+                'compliance_level': float(self.compliance_level[row, p] + gain[k]),
+                'gain': float(gain[k])
+            } for k in selected]
+
+        return result
+
+
+if __name__ == '__main__':
+    s = Sensitivity(Data())
+    print(s.ranking(top=3))
@@ -1,9 +1,229 @@
+import json
+import os
+import tempfile
 import unittest
 
+import matplotlib
+import numpy as np
 
-class MyTestCase(unittest.TestCase):
-    def test_something(self):
-        self.assertEqual(True, False)  # add assertion here
+matplotlib.use('Agg')
+
+from analysis.data import Data, FAIR_MATURITY_MODEL, FAIR_PRINCIPLES, classification_sum, compliance_level
+from analysis.evolution import Evolution
+from analysis.sensitivity import Sensitivity
+
+
+def response(response_id: str, values: dict, default: int = 3) -> dict:
+    """
+    Build a response with every indicator at the default value except the ones given in values
+    """
+    result = {"id": response_id, "submitdate": "2024-02-08 14:49:43", "datestamp": "2024-02-08 14:49:43"}
+
+    for key, indicator in FAIR_MATURITY_MODEL.items():
+        result[key] = str(values.get(indicator, default))
+
+    return result
+
+
+class DataTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, responses: list) -> str:
+        filename = os.path.join(self.directory.name, f"responses{len(os.listdir(self.directory.name))}.json")
+
+        with open(file=filename, mode='w') as f:
+            json.dump({'responses': responses}, f)
+
+        return filename
+
+    def test_compliance_level_matches_data(self):
+        rng = np.random.default_rng(0)
+        indicators = list(FAIR_MATURITY_MODEL.values())
+
+        responses = [response("1", {}, default=5), response("2", {}, default=1)]
+        for i in range(3, 40):
+            low = int(rng.integers(1, 6))
+            responses.append(response(str(i), {x: int(rng.integers(low, 6)) for x in indicators}))
+
+        _, maturity = Data(json_file=self.write(responses)).get_maturity_matrix()
+        level = compliance_level(*classification_sum(maturity))
+
+        for i, x in enumerate(responses):
+            expected = Data(json_file=self.write([x])).FMMClassification_data_compliance_level
+
+            self.assertEqual([expected[p] for p in FAIR_PRINCIPLES.values()], list(level[i]))
+
+    def test_ranking_essential_unlocks_important(self):
+        # Every Accessible Essential indicator at 5 but one, so raising it to 5 adds the Important term
+        accessible_essential = ['RDA-A1-02M', 'RDA-A1-02D', 'RDA-A1-03M', 'RDA-A1-03D', 'RDA-A1-04M',
+                                'RDA-A1-04D', 'RDA-A1.1-01M', 'RDA-A2-01M']
+        values = {x: 5 for x in accessible_essential}
+        values['RDA-A1-02M'] = 4
+
+        sensitivity = Sensitivity(Data(json_file=self.write([response("1", values)])))
+        ranking = sensitivity.ranking(response_id="1")
+
+        # Essential (39 - 8) / 32 without Important, 1 + Important (9 - 3) / 12 * 2 after the improvement
+        self.assertEqual(ranking['Accessible'], [{
+            'indicator': 'RDA-A1-02M',
+            'current': 4,
+            'value': 5,
+            'compliance_level': 2.0,
+            'gain': 2.0 - 31 / 32
+        }])
+
+    def test_gain_matches_data(self):
+        rng = np.random.default_rng(1)
+        indicators = list(FAIR_MATURITY_MODEL.values())
+        principles = list(FAIR_PRINCIPLES.values())
+
+        responses = [response("1", {}), response("2", {x: int(rng.integers(4, 6)) for x in indicators})]
+        for i in range(3, 6):
+            low = int(rng.integers(1, 5))
+            responses.append(response(str(i), {x: int(rng.integers(low, 6)) for x in indicators}))
+
+        sensitivity = Sensitivity(Data(json_file=self.write(responses)))
+
+        for r, x in enumerate(responses):
+            current = Data(json_file=self.write([x])).FMMClassification_data_compliance_level
+
+            for i, (key, indicator) in enumerate(FAIR_MATURITY_MODEL.items()):
+                principle = principles[sensitivity.principle_index[i]]
+
+                for v, value in enumerate(sensitivity.values):
+                    if value <= int(x[key]):
+                        self.assertTrue(np.isnan(sensitivity.gain[r, i, v]))
+                        continue
+
+                    improved = dict(x)
+                    improved[key] = str(value)
+                    level = Data(json_file=self.write([improved])).FMMClassification_data_compliance_level
+
+                    self.assertAlmostEqual(level[principle] - current[principle], sensitivity.gain[r, i, v])
+
+    def test_ranking_order_and_truncation(self):
+        essential = ['RDA-R1-01M', 'RDA-R1.1-01M', 'RDA-R1.3-01M', 'RDA-R1.3-01D', 'RDA-R1.3-02M']
+        others = ['RDA-R1.1-02M', 'RDA-R1.1-03M', 'RDA-R1.2-01M', 'RDA-R1.3-02D', 'RDA-R1.2-02M']
+
+        data = Data(json_file=self.write([response("1", {}), response("2", {}, default=5)]))
+        sensitivity = Sensitivity(data)
+
+        def reusable(**kwargs):
+            return [(x['indicator'], x['value']) for x in sensitivity.ranking(response_id="1", **kwargs)['Reusable']]
+
+        # Every Reusable Essential indicator at 3: raising one to 5 gains 2 / 20, to 4 gains 1 / 20.
+        # The gains tie, so the indicators keep their order.
+        expected = [(x, 5) for x in essential] + [(x, 4) for x in essential]
+        self.assertEqual(reusable(), expected)
+        self.assertEqual(reusable(top=7), expected[:7])
+        self.assertEqual(reusable(min_gain=0.075), expected[:5])
+
+        # The Important and Useful indicators gain nothing until Essential is complete; the smallest
+        # increment goes first
+        self.assertEqual(reusable(min_gain=-1.0), expected + [(x, 4) for x in others] + [(x, 5) for x in others])
+
+        # Interoperable has no Essential indicators, so its compliance level never changes
+        self.assertEqual(sensitivity.ranking(response_id="1")['Interoperable'], [])
+
+        self.assertEqual(sensitivity.ranking(), sensitivity.ranking(response_id="1"))
+        self.assertEqual(sensitivity.cohort_ranking(top=3),
+                         {x: sensitivity.ranking(response_id=x, top=3) for x in ["1", "2"]})
+        self.assertEqual(sensitivity.ranking(response_id="2"), {x: [] for x in FAIR_PRINCIPLES.values()})
+
+        with self.assertRaisesRegex(ValueError, "not fully answered: 3"):
+            sensitivity.ranking(response_id="3")
+
+    def test_partial_responses_are_skipped(self):
+        partial = response("2", {})
+        partial['submitdate'] = None
+        partial['FDMFE1[SQ001]'] = None
+        partial['FDMRE1[SQ001]'] = ""
+
+        data = Data(json_file=self.write([response("1", {}), partial, response("3", {}, default=5)]))
+        response_ids, maturity = data.get_maturity_matrix()
+
+        self.assertEqual(response_ids, ["1", "3"])
+        self.assertEqual(maturity.shape, (2, len(FAIR_MATURITY_MODEL)))
+        self.assertEqual(len(data.get_response_dates()), 2)
+        self.assertEqual(list(Evolution(data).count), [2])
+
+        # A partial first response does not break Data, which describes the first answered one
+        data = Data(json_file=self.write([partial, response("3", {}, default=5)]))
+
+        self.assertEqual(data.response_id, "3")
+        self.assertEqual(data.FMMClassification_data_compliance_level,
+                         {'Findable': 3.0, 'Accessible': 5.0, 'Interoperable': 1.0, 'Reusable': 5.0})
+
+    def test_evolution_per_period(self):
+        rng = np.random.default_rng(2)
+        indicators = list(FAIR_MATURITY_MODEL.values())
+        dates = {
+            "1": ("2024-02-08 14:49:43", "2024-02-08 14:49:43"),
+            "2": ("2023-11-20 10:00:00", "2023-11-20 10:00:00"),
+            # Not submitted, bucketed by its datestamp
+            "3": (None, "2024-05-02 09:30:00"),
+            "4": ("2024-03-30 18:00:00", "2024-03-30 18:00:00"),
+            # The submit date wins over a later datestamp
+            "5": ("2023-12-31 23:59:59", "2024-01-01 00:00:10")
+        }
+
+        responses = list()
+        for x, (submitdate, datestamp) in dates.items():
+            result = response(x, {y: int(rng.integers(int(x), 6)) for y in indicators})
+            result['submitdate'], result['datestamp'] = submitdate, datestamp
+            responses.append(result)
+
+        data = Data(json_file=self.write(responses))
+        level = {x["id"]: [Data(json_file=self.write([x])).FMMClassification_data_compliance_level[p]
+                           for p in FAIR_PRINCIPLES.values()] for x in responses}
+
+        expected = {
+            'quarter': {'2023-Q4': ["2", "5"], '2024-Q1': ["1", "4"], '2024-Q2': ["3"]},
+            'year': {'2023': ["2", "5"], '2024': ["1", "3", "4"]},
+            'month': {'2023-11': ["2"], '2023-12': ["5"], '2024-02': ["1"], '2024-03': ["4"], '2024-05': ["3"]}
+        }
+
+        for period, groups in expected.items():
+            evolution = Evolution(data, period=period)
+
+            self.assertEqual(evolution.period_labels, list(groups.keys()))
+            self.assertEqual(list(evolution.count), [len(x) for x in groups.values()])
+
+            for i, ids in enumerate(groups.values()):
+                values = np.array([level[x] for x in ids])
+
+                np.testing.assert_allclose(evolution.compliance_level[i], values.mean(axis=0))
+                np.testing.assert_array_equal(evolution.compliance_level_minimum[i], values.min(axis=0))
+                np.testing.assert_array_equal(evolution.compliance_level_maximum[i], values.max(axis=0))
+
+        with self.assertRaisesRegex(ValueError, "Unknown value for 'period'"):
+            Evolution(data, period='week')
+
+    def test_evolution_animations(self):
+        responses = [response("1", {}), response("2", {}, default=5)]
+        responses[1]['submitdate'] = "2024-06-01 12:00:00"
+
+        evolution = Evolution(Data(json_file=self.write(responses)))
+
+        radar = os.path.join(self.directory.name, "findable.gif")
+        level_score = os.path.join(self.directory.name, "level_score.gif")
+        evolution.save_radar_animation(category='Findable', filename=radar)
+        evolution.save_level_score_animation(filename=level_score)
+
+        for filename in [radar, level_score]:
+            with open(file=filename, mode='rb') as f:
+                self.assertEqual(f.read(6), b'GIF89a')
+
+    def test_invalid_maturity_value(self):
+        invalid = response("2", {})
+        invalid['FDMFE1[SQ001]'] = "N/A"
+
+        with self.assertRaisesRegex(ValueError, "not an integer: 2"):
+            Data(json_file=self.write([response("1", {}), invalid]))
 
 
 if __name__ == '__main__':